@@ -0,0 +1,557 @@
+#!/usr/bin/env python3
+"""
+Reproduzierbare Benchmarks und Lasttests für server.py und epe.parser.
+
+Das Skript erzeugt einen synthetischen Korpus (Zeugen, Abschnitte, Tokens,
+Annotationen und Alignment-Gruppen) mit festem Seed, startet den Server in
+einem temporären Verzeichnis auf einem freien Port und misst
+
+* jeden Endpunkt des ``RequestHandler`` (``http.*``),
+* parallele Lesezugriffe als einfachen Lasttest (``load.*``),
+* ``parse_alto``, das Alignment und die Persistenz direkt im Prozess (``micro.*``).
+
+Solange ``parse_alto`` ein Platzhalter ist, der die Datei nicht liest, misst
+``micro.parse_alto`` nur den Aufruf des Stubs. Der Eintrag bleibt trotzdem
+bestehen, damit ``compare`` die echte Implementierung gegen eine Baseline
+prüft, sobald sie verfügbar ist.
+
+Die Daten unter ``data/`` werden dabei nicht verändert. Die Ergebnisse
+werden als JSON geschrieben; der Vergleichsmodus markiert Regressionen
+zwischen zwei Läufen:
+
+    python benchmark.py run --witnesses 10 --tokens 500 --output before.json
+    python benchmark.py run --witnesses 10 --tokens 500 --output after.json
+    python benchmark.py compare before.json after.json --threshold 0.1
+"""
+
+import argparse
+import datetime
+import http.client
+import importlib.util
+import json
+import os
+import platform
+import random
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from epe.binformat import decode_witnesses, encode_witnesses
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Dateien, die der Server im temporären Verzeichnis benötigt.
+SERVER_FILES = ['server.py', 'index.html', 'script.js', 'style.css', 'epe']
+
+# Kleines arabisches Vokabular; Varianten entstehen durch Buchstabentausch.
+VOCABULARY = ['بسم', 'الله', 'الرحمن', 'الرحيم', 'الحمد', 'لله', 'رب', 'العالمين',
+              'مالك', 'يوم', 'الدين', 'اياك', 'نعبد', 'نستعين', 'اهدنا', 'الصراط']
+VARIANT_LETTERS = 'ابتثجحخدذرزسشصضطظعغفقكلمنهوي'
+
+
+# --------------------------------------------------------------------------
+# Synthetischer Korpus
+# --------------------------------------------------------------------------
+
+def generate_corpus(n_witnesses, n_sections, n_tokens, n_annotations, n_groups, seed):
+    """Erzeugt Zeugen, Annotationen und Alignment-Gruppen im Format von data/."""
+    rng = random.Random(seed)
+    witnesses = []
+    for wi in range(1, n_witnesses + 1):
+        wid = f'w{wi}'
+        sections = []
+        for si in range(1, n_sections + 1):
+            tokens = []
+            for ti in range(1, n_tokens + 1):
+                word = VOCABULARY[(ti - 1) % len(VOCABULARY)]
+                if rng.random() < 0.1:
+                    pos = rng.randrange(len(word))
+                    word = word[:pos] + rng.choice(VARIANT_LETTERS) + word[pos + 1:]
+                line, col = divmod(ti - 1, 12)
+                tokens.append({
+                    'id': f'{wid}s{si}t{ti}',
+                    'text': word,
+                    'position': ti,
+                    'bbox': {'x': 100 + col * 70, 'y': 200 + line * 30,
+                             'width': rng.randint(40, 70), 'height': 20},
+                })
+            sections.append({'id': f'{wid}s{si}', 'order_no': si, 'type': 'page', 'tokens': tokens})
+        witnesses.append({
+            'id': wid,
+            'siglum': f'MS_{wi:03d}',
+            'label': f'MS_{wi:03d} – synthetisch',
+            'metadata': {'language': 'ar', 'date': str(1200 + wi)},
+            'sections': sections,
+        })
+
+    annotations = []
+    for ai in range(1, n_annotations + 1):
+        wi = rng.randint(1, n_witnesses)
+        annotations.append({
+            'id': ai,
+            'witness_id': f'w{wi}',
+            'token_id': f'w{wi}s{rng.randint(1, n_sections)}t{rng.randint(1, n_tokens)}',
+            'annotation': f'Anmerkung {ai}',
+            'timestamp': '2025-01-01T00:00:00',
+        })
+
+    # Gruppen verweisen auf den ersten Abschnitt, mit gelegentlichen Lücken.
+    groups = []
+    for gi in range(1, n_groups + 1):
+        ti = (gi - 1) % n_tokens + 1
+        groups.append({f'w{wi}': f'w{wi}s1t{ti}' for wi in range(1, n_witnesses + 1)
+                       if rng.random() > 0.05})
+    return witnesses, annotations, groups
+
+
+def alignment_csv(groups, witness_ids):
+    """Serialisiert Alignment-Gruppen in das CSV-Format von /api/alignments/import."""
+    lines = [','.join(witness_ids)]
+    for group in groups:
+        lines.append(','.join(group.get(wid, '') for wid in witness_ids))
+    return '\n'.join(lines) + '\n'
+
+
+def alto_xml(witness):
+    """Erzeugt eine minimale ALTO-Datei aus dem ersten Abschnitt eines Zeugen."""
+    strings = ''.join(
+        f'<String ID="{tok["id"]}" CONTENT="{tok["text"]}" HPOS="{tok["bbox"]["x"]}" '
+        f'VPOS="{tok["bbox"]["y"]}" WIDTH="{tok["bbox"]["width"]}" HEIGHT="{tok["bbox"]["height"]}"/>'
+        for tok in witness['sections'][0]['tokens'])
+    return ('<?xml version="1.0" encoding="UTF-8"?>'
+            '<alto xmlns="http://www.loc.gov/standards/alto/ns-v4#"><Layout><Page ID="p1">'
+            f'<PrintSpace><TextBlock ID="b1"><TextLine ID="l1" BASELINE="0 0 1000 0">{strings}'
+            '</TextLine></TextBlock></PrintSpace></Page></Layout></alto>')
+
+
+def write_corpus(root, witnesses, annotations, groups):
+    data_dir = os.path.join(root, 'data')
+    os.makedirs(data_dir, exist_ok=True)
+    for name, content in (('witnesses.json', witnesses), ('annotations.json', annotations),
+                          ('alignments.json', groups)):
+        with open(os.path.join(data_dir, name), 'w', encoding='utf-8') as f:
+            json.dump(content, f, ensure_ascii=False, indent=2)
+
+
+def prepare_tree(root):
+    """Kopiert Server und Frontend in ein temporäres Verzeichnis."""
+    for name in SERVER_FILES:
+        src = os.path.join(BASE_DIR, name)
+        if os.path.isdir(src):
+            shutil.copytree(src, os.path.join(root, name),
+                            ignore=shutil.ignore_patterns('__pycache__'))
+        elif os.path.exists(src):
+            shutil.copy(src, root)
+
+
+# --------------------------------------------------------------------------
+# Messung
+# --------------------------------------------------------------------------
+
+def summarize(samples, errors=0):
+    """Fasst Laufzeiten (Sekunden) zu Kennzahlen zusammen."""
+    if not samples:
+        return {'n': 0, 'errors': errors}
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    return {
+        'n': len(samples),
+        'errors': errors,
+        'mean': statistics.fmean(samples),
+        'median': statistics.median(samples),
+        'p95': p95,
+        'min': ordered[0],
+        'max': ordered[-1],
+    }
+
+
+def time_call(func, repeat, warmup):
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(root, port, timeout=30.0):
+    proc = subprocess.Popen(
+        [sys.executable, '-c', f'import server; server.PORT = {port}; server.run_server()'],
+        cwd=root, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError('Server exited during startup')
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.5):
+                return proc
+        except OSError:
+            time.sleep(0.05)
+    proc.terminate()
+    raise RuntimeError('Server did not start in time')
+
+
+def request(port, method, path, body=None, content_type='application/json'):
+    """Führt eine Anfrage aus und gibt (Status, Laufzeit in Sekunden) zurück."""
+    headers = {'Content-Type': content_type} if body is not None else {}
+    start = time.perf_counter()
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+    try:
+        conn.request(method, path, body=body, headers=headers)
+        resp = conn.getresponse()
+        resp.read()
+        status = resp.status
+    finally:
+        conn.close()
+    return status, time.perf_counter() - start
+
+
+def http_cases(witnesses, groups):
+    """
+    Liefert (Name, Fabrik) für jeden Endpunkt. Die Fabrik erhält die laufende
+    Iteration und gibt eine Liste von (Methode, Pfad, Body, Content-Type,
+    erwarteter Status, gemessen) zurück; nicht gemessene Schritte bereiten den
+    gemessenen vor oder räumen danach auf, damit die Korpusgröße konstant bleibt.
+    """
+    w_ids = [w['id'] for w in witnesses]
+    base, other = witnesses[0], witnesses[-1]
+    base_sec, other_sec = base['sections'][0]['id'], other['sections'][0]['id']
+    template = dict(base, sections=base['sections'][:1])
+    csv_body = alignment_csv(groups, w_ids).encode('utf-8')
+    json_type, bin_type, csv_type = 'application/json', 'application/octet-stream', 'text/csv'
+
+    def new_witness(i):
+        return dict(template, id=f'bench_w{i}', label=f'Bench {i}')
+
+    def new_annotation():
+        return json.dumps({'witness_id': base['id'], 'token_id': base['sections'][0]['tokens'][0]['id'],
+                           'annotation': 'bench'}).encode('utf-8')
+
+    return [
+        ('OPTIONS /api/witnesses', lambda i: [('OPTIONS', '/api/witnesses', None, None, 204, True)]),
+        ('GET /index.html', lambda i: [('GET', '/index.html', None, None, 200, True)]),
+        ('GET /api/witnesses', lambda i: [('GET', '/api/witnesses', None, None, 200, True)]),
+        ('GET /api/witnesses/<id>', lambda i: [('GET', f'/api/witnesses/{base["id"]}', None, None, 200, True)]),
+        ('GET /api/witnesses/<id>/tokens', lambda i: [
+            ('GET', f'/api/witnesses/{base["id"]}/tokens?section={base_sec}&start=0&stop=50',
+             None, None, 200, True)]),
+        ('GET /api/alignments', lambda i: [
+            ('GET', f'/api/alignments?base={base["id"]}&witness={other["id"]}'
+                    f'&base_section={base_sec}&witness_section={other_sec}', None, None, 200, True)]),
+        ('GET /api/annotations', lambda i: [('GET', '/api/annotations', None, None, 200, True)]),
+        ('GET /api/annotations?witness_id', lambda i: [
+            ('GET', f'/api/annotations?witness_id={base["id"]}', None, None, 200, True)]),
+        ('GET /api/export/<id>', lambda i: [('GET', f'/api/export/{base["id"]}', None, None, 200, True)]),
+        ('GET /api/export/<id>?format=epeb', lambda i: [
+            ('GET', f'/api/export/{base["id"]}?format=epeb', None, None, 200, True)]),
+        ('GET /api/tei/<id>', lambda i: [('GET', f'/api/tei/{base["id"]}', None, None, 200, True)]),
+        ('GET /api/logs', lambda i: [('GET', '/api/logs', None, None, 200, True)]),
+        ('GET /api/logs/export', lambda i: [('GET', '/api/logs/export', None, None, 200, True)]),
+        ('POST /api/witnesses', lambda i: [
+            ('POST', '/api/witnesses', json.dumps(new_witness(i)).encode('utf-8'), json_type, 201, True),
+            ('DELETE', f'/api/witnesses/bench_w{i}', None, None, 204, False)]),
+        ('POST /api/import/epeb', lambda i: [
+            ('POST', '/api/import/epeb', encode_witnesses([new_witness(i)]), bin_type, 201, True),
+            ('DELETE', f'/api/witnesses/bench_w{i}', None, None, 204, False)]),
+        ('PATCH /api/witnesses/<id>', lambda i: [
+            ('PATCH', f'/api/witnesses/{base["id"]}', json.dumps({'label': base['label']}).encode('utf-8'),
+             json_type, 200, True)]),
+        ('DELETE /api/witnesses/<id>', lambda i: [
+            ('POST', '/api/witnesses', json.dumps(new_witness(i)).encode('utf-8'), json_type, 201, False),
+            ('DELETE', f'/api/witnesses/bench_w{i}', None, None, 204, True)]),
+        ('POST /api/alignments/import', lambda i: [
+            ('POST', '/api/alignments/import', csv_body, csv_type, 201, True)]),
+        # Annotationen: POST, PUT und DELETE teilen sich eine Annotation pro Iteration.
+        ('POST /api/annotations', lambda i: [
+            ('POST', '/api/annotations', new_annotation(), json_type, 201, True),
+            ('DELETE', '/api/annotations/{last}', None, None, 204, False)]),
+        ('PUT /api/annotations/<id>', lambda i: [
+            ('POST', '/api/annotations', new_annotation(), json_type, 201, False),
+            ('PUT', '/api/annotations/{last}', json.dumps({'annotation': 'edit'}).encode('utf-8'),
+             json_type, 200, True),
+            ('DELETE', '/api/annotations/{last}', None, None, 204, False)]),
+        ('DELETE /api/annotations/<id>', lambda i: [
+            ('POST', '/api/annotations', new_annotation(), json_type, 201, False),
+            ('DELETE', '/api/annotations/{last}', None, None, 204, True)]),
+    ]
+
+
+def run_http(port, witnesses, groups, n_annotations, repeat, warmup):
+    """Misst jeden Endpunkt sequenziell."""
+    results = {}
+    # Der Server vergibt Annotation-IDs fortlaufend ab max(id) + 1.
+    next_ann = n_annotations + 1
+    for name, factory in http_cases(witnesses, groups):
+        samples, errors = [], 0
+        for i in range(warmup + repeat):
+            for method, path, body, ctype, expected, measured in factory(i):
+                if method == 'POST' and path == '/api/annotations':
+                    last_ann = next_ann
+                    next_ann += 1
+                path = path.replace('{last}', str(last_ann)) if '{last}' in path else path
+                status, elapsed = request(port, method, path, body, ctype or 'application/json')
+                if status != expected:
+                    errors += 1
+                elif measured and i >= warmup:
+                    samples.append(elapsed)
+        results[f'http.{name}'] = summarize(samples, errors)
+    return results
+
+
+def run_load(port, witnesses, concurrency, total):
+    """Parallele Lesezugriffe auf die häufigsten Endpunkte."""
+    base, other = witnesses[0], witnesses[-1]
+    paths = [
+        '/api/witnesses',
+        f'/api/witnesses/{base["id"]}',
+        f'/api/witnesses/{other["id"]}/tokens?start=0&stop=50',
+        f'/api/alignments?base={base["id"]}&witness={other["id"]}',
+        f'/api/annotations?witness_id={base["id"]}',
+    ]
+    lock = threading.Lock()
+    samples, errors = [], [0]
+
+    def worker(k):
+        try:
+            status, elapsed = request(port, 'GET', paths[k % len(paths)])
+        except OSError:
+            status, elapsed = None, None
+        with lock:
+            if status == 200:
+                samples.append(elapsed)
+            else:
+                errors[0] += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(worker, range(total)))
+    wall = time.perf_counter() - start
+    summary = summarize(samples, errors[0])
+    summary['concurrency'] = concurrency
+    summary['throughput_rps'] = len(samples) / wall if wall else 0.0
+    return {'load.mixed_reads': summary}
+
+
+def load_module(name, path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_micro(root, witnesses, annotations, groups, repeat, warmup):
+    """Misst Parser, Alignment und Persistenz direkt im Prozess (auf der Kopie unter ``root``)."""
+    results = {}
+    parser = load_module('bench_epe_parser', os.path.join(root, 'epe', 'parser.py'))
+    alto_path = os.path.join(root, 'bench_alto.xml')
+    with open(alto_path, 'w', encoding='utf-8') as f:
+        f.write(alto_xml(witnesses[0]))
+    results['micro.parse_alto'] = time_call(lambda: parser.parse_alto(alto_path), repeat, warmup)
+
+    srv = load_module('bench_server', os.path.join(root, 'server.py'))
+    srv.witnesses = witnesses
+    srv.annotations = annotations
+    base, other = witnesses[0], witnesses[-1]
+    base_sec, other_sec = base['sections'][0], other['sections'][0]
+
+    def align():
+        srv.build_alignments(base['id'], other['id'], base, other, base_sec, other_sec)
+
+    srv.alignment_groups = []
+    results['micro.alignment_positional'] = time_call(align, repeat, warmup)
+    srv.alignment_groups = groups
+    results['micro.alignment_groups'] = time_call(align, repeat, warmup)
+
+    results['micro.save_witnesses'] = time_call(srv.save_witnesses, repeat, warmup)
+    results['micro.load_witnesses'] = time_call(srv.load_witnesses, repeat, warmup)
+    results['micro.save_annotations'] = time_call(srv.save_annotations, repeat, warmup)
+    results['micro.load_annotations'] = time_call(srv.load_annotations, repeat, warmup)
+    results['micro.load_alignment_groups'] = time_call(srv.load_alignment_groups, repeat, warmup)
+    if srv.witness_archive is not None:
+        srv.witness_archive.close()
+
+    payload = encode_witnesses(witnesses)
+    results['micro.epeb_encode'] = time_call(lambda: encode_witnesses(witnesses), repeat, warmup)
+    results['micro.epeb_decode'] = time_call(lambda: decode_witnesses(payload), repeat, warmup)
+    return results
+
+
+def git_revision():
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR,
+                             capture_output=True, text=True, timeout=10)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run(args):
+    corpus = generate_corpus(args.witnesses, args.sections, args.tokens,
+                             args.annotations, args.alignment_groups, args.seed)
+    witnesses, annotations, groups = corpus
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='epe_bench_') as root:
+        prepare_tree(root)
+        if not args.skip_http:
+            write_corpus(root, witnesses, annotations, groups)
+            port = free_port()
+            proc = start_server(root, port)
+            try:
+                results.update(run_http(port, witnesses, groups, len(annotations), args.repeat, args.warmup))
+                if args.load_requests:
+                    results.update(run_load(port, witnesses, args.concurrency, args.load_requests))
+            finally:
+                proc.terminate()
+                proc.wait(timeout=10)
+        if not args.skip_micro:
+            # Frischer Korpus, damit Änderungen aus den HTTP-Läufen nicht einfließen.
+            write_corpus(root, witnesses, annotations, groups)
+            results.update(run_micro(root, witnesses, annotations, groups, args.repeat, args.warmup))
+
+    report = {
+        'meta': {
+            'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'corpus': {
+                'witnesses': args.witnesses, 'sections': args.sections, 'tokens': args.tokens,
+                'annotations': args.annotations, 'alignment_groups': args.alignment_groups,
+                'seed': args.seed,
+            },
+            'repeat': args.repeat,
+            'warmup': args.warmup,
+        },
+        'results': results,
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+    failed = [name for name, stats in results.items() if stats.get('errors')]
+    for name in failed:
+        print(f'Fehler in {name}: {results[name]["errors"]}', file=sys.stderr)
+    return 1 if failed else 0
+
+
+def format_ms(seconds):
+    return f'{seconds * 1000:9.3f}ms' if seconds is not None else f'{"-":>11}'
+
+
+def compare_entry(before_stats, after_stats, metric, threshold):
+    """
+    Bewertet einen Benchmark aus zwei Läufen.
+
+    Gibt ((vorher, nachher, Verhältnis), Status) zurück. Als Regression gilt
+    auch, wenn der Benchmark im aktuellen Lauf fehlt, mehr Fehler hat als in
+    der Baseline oder keinen Messwert mehr liefert.
+    """
+    if after_stats is None:
+        return (before_stats.get(metric), None, None), 'REGRESSION (missing)'
+    after = after_stats.get(metric)
+    if before_stats is None:
+        return (None, after, None), 'new'
+    before = before_stats.get(metric)
+    if after_stats.get('errors', 0) > before_stats.get('errors', 0):
+        return (before, after, None), 'REGRESSION (errors)'
+    if after is None:
+        return (before, None, None), 'REGRESSION (no data)' if before is not None else 'no data'
+    if before is None:
+        return (None, after, None), 'no baseline'
+    if before == 0:
+        return (before, after, None), 'REGRESSION' if after > 0 else 'ok'
+    ratio = after / before
+    if ratio > 1 + threshold:
+        status = 'REGRESSION'
+    elif ratio < 1 - threshold:
+        status = 'improved'
+    else:
+        status = 'ok'
+    return (before, after, ratio), status
+
+
+def compare(args):
+    """Vergleicht zwei Ergebnisdateien; Exit-Code 1 bei Regressionen."""
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        old = json.load(f)
+    with open(args.current, 'r', encoding='utf-8') as f:
+        new = json.load(f)
+    if old['meta'].get('corpus') != new['meta'].get('corpus'):
+        print('Warnung: unterschiedliche Korpusparameter, Vergleich nur bedingt aussagekräftig',
+              file=sys.stderr)
+
+    regressions = []
+    rows = []
+    for name in sorted(set(old['results']) | set(new['results'])):
+        row, status = compare_entry(old['results'].get(name), new['results'].get(name),
+                                    args.metric, args.threshold)
+        rows.append((name,) + row + (status,))
+        if status.startswith('REGRESSION'):
+            regressions.append(name)
+
+    width = max((len(r[0]) for r in rows), default=10)
+    print(f'{"benchmark":<{width}}  {"before":>10}  {"after":>10}  {"ratio":>6}  status')
+    for name, before, after, ratio, status in rows:
+        ratio_str = f'{ratio:6.2f}' if ratio is not None else f'{"-":>6}'
+        print(f'{name:<{width}} {format_ms(before)} {format_ms(after)}  {ratio_str}  {status}')
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'metric': args.metric, 'threshold': args.threshold, 'regressions': regressions,
+                       'rows': [dict(zip(('name', 'before', 'after', 'ratio', 'status'), r)) for r in rows]},
+                      f, indent=2)
+            f.write('\n')
+    return 1 if regressions else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmarks und Lasttests für den Prototyp.')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('run', help='Benchmarks ausführen')
+    p.add_argument('--witnesses', type=int, default=5)
+    p.add_argument('--sections', type=int, default=4)
+    p.add_argument('--tokens', type=int, default=200, help='Tokens pro Abschnitt')
+    p.add_argument('--annotations', type=int, default=500)
+    p.add_argument('--alignment-groups', type=int, default=200)
+    p.add_argument('--seed', type=int, default=1)
+    p.add_argument('--repeat', type=int, default=20, help='Messungen pro Benchmark')
+    p.add_argument('--warmup', type=int, default=2)
+    p.add_argument('--concurrency', type=int, default=4)
+    p.add_argument('--load-requests', type=int, default=200, help='0 deaktiviert den Lasttest')
+    p.add_argument('--skip-http', action='store_true')
+    p.add_argument('--skip-micro', action='store_true')
+    p.add_argument('--output', help='Zieldatei (Standard: stdout)')
+
+    p = sub.add_parser('compare', help='Zwei Ergebnisdateien vergleichen')
+    p.add_argument('baseline')
+    p.add_argument('current')
+    p.add_argument('--metric', default='median', choices=['mean', 'median', 'p95', 'min', 'max'])
+    p.add_argument('--threshold', type=float, default=0.1, help='Erlaubte relative Verschlechterung')
+    p.add_argument('--output', help='Vergleich zusätzlich als JSON schreiben')
+
+    args = parser.parse_args(argv)
+    if args.command == 'run':
+        if min(args.witnesses, args.sections, args.tokens) < 1:
+            parser.error('--witnesses, --sections and --tokens must be at least 1')
+        return run(args)
+    return compare(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
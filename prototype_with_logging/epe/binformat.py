@@ -0,0 +1,571 @@
+"""
+Kompaktes Binärformat für Zeugen (``.epeb``).
+
+Die JSON-Dateien unter ``data/`` werden mit ``indent=2`` geschrieben und sind
+dadurch um ein Vielfaches größer als nötig; außerdem muss beim Laden stets die
+gesamte Datei geparst werden. Dieses Modul definiert ein spaltenorientiertes
+Binärformat, das mehrere Zeugen in einer Datei ablegt:
+
+* Eine String-Tabelle (Offsets + UTF‑8-Blob) enthält jede Zeichenkette genau
+  einmal – Token-Texte, IDs, Abschnittstypen und kompakt serialisierte
+  Zusatzfelder.
+* Zeugen, Abschnitte und Tokens liegen als gepackte ``int32``-Tabellen vor,
+  die Bounding-Boxen als gepacktes Koordinaten-Array (``int32`` oder
+  ``float64``), Baselines als ein gemeinsames ``int32``-Array.
+
+Alle Blöcke sind 8‑Byte-ausgerichtet und little-endian. ``WitnessArchive``
+bildet die Datei per ``mmap`` ab und legt ``memoryview``-Sichten auf die Blöcke,
+sodass einzelne Abschnitte oder Token-Bereiche ohne vollständige Dekodierung
+gelesen werden können.
+
+Felder, die nicht dem Schema aus ``epe/parser.py`` entsprechen (unbekannte
+Schlüssel, nicht-numerische Bounding-Boxen, Abschnitte oder Tokens, die keine
+Objekte sind usw.), werden verlustfrei als kompaktes JSON in der
+String-Tabelle abgelegt.
+
+Konvertierung auf der Kommandozeile:
+    python -m epe.binformat to-binary data/witnesses.json data/witnesses.epeb
+    python -m epe.binformat to-json data/witnesses.epeb witnesses.json
+    python -m epe.binformat bench data/witnesses.json
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from typing import Any, Dict, List, Optional
+
+MAGIC = b'EPEB'
+VERSION = 2
+
+# Platzhalter für fehlende Werte in den int32-Tabellen.
+NONE = -2 ** 31
+
+# Reihenfolge der Blöcke im Header.
+_BLOCKS = (
+    'str_offsets',   # uint32, n_strings + 1
+    'str_data',      # UTF-8
+    'witnesses',     # int32 [n_witnesses, 6]
+    'sections',      # int32 [n_sections, 6]
+    'tokens',        # int32 [n_tokens, 7]
+    'coords',        # int32/float64 [n_tokens, 4]
+    'baselines',     # int32
+)
+_HEADER = struct.Struct('<4sHcx' + 'QQ' * len(_BLOCKS))
+
+_WITNESS_COLS = 6   # id, siglum, label, extra, section_start, section_count
+_SECTION_COLS = 6   # id, order_no, type, extra, token_start, token_count
+_TOKEN_COLS = 7     # id, text, position, extra, baseline_start, baseline_count, flags
+
+_FLAG_BBOX = 1
+# Bits 1-4: die jeweilige Koordinate (x, y, width, height) war ein float.
+_FLAG_FLOAT = (2, 4, 8, 16)
+_BBOX_KEYS = ('x', 'y', 'width', 'height')
+_INT32_MIN, _INT32_MAX = -2 ** 31 + 1, 2 ** 31 - 1
+
+
+class BinaryFormatError(ValueError):
+    """Wird ausgelöst, wenn eine Datei kein gültiges ``.epeb`` ist."""
+
+
+def _is_int32(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool) and _INT32_MIN <= value <= _INT32_MAX
+
+
+def _is_coordinate(value: Any) -> bool:
+    return isinstance(value, float) or _is_int32(value)
+
+
+def _compact(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+class _StringTable:
+    """Sammelt Zeichenketten und vergibt für jede eindeutige einen Index."""
+
+    def __init__(self):
+        self.index: Dict[str, int] = {}
+        self.offsets = array('I', [0])
+        self.data = bytearray()
+
+    def add(self, value: Optional[str]) -> int:
+        if value is None:
+            return NONE
+        idx = self.index.get(value)
+        if idx is None:
+            idx = len(self.index)
+            self.index[value] = idx
+            self.data += value.encode('utf-8')
+            self.offsets.append(len(self.data))
+        return idx
+
+
+def _string_or_extra(record: Dict[str, Any], key: str, extra: Dict[str, Any], strings: _StringTable) -> int:
+    """Legt ``record[key]`` in der String-Tabelle ab, sofern es ein String ist."""
+    value = record.get(key)
+    if key in record and not isinstance(value, str):
+        extra[key] = value
+        return NONE
+    return strings.add(value)
+
+
+def _int_or_extra(record: Dict[str, Any], key: str, extra: Dict[str, Any]) -> int:
+    value = record.get(key)
+    if key in record and not _is_int32(value):
+        extra[key] = value
+        return NONE
+    return NONE if value is None else value
+
+
+def encode_witnesses(witnesses: List[Dict[str, Any]]) -> bytes:
+    """Serialisiert eine Liste von Zeugen (JSON-Struktur) in das Binärformat."""
+    strings = _StringTable()
+    wit_rows = array('i')
+    sec_rows = array('i')
+    tok_rows = array('i')
+    coords: List[Any] = []
+    baselines = array('i')
+
+    for wit in witnesses:
+        if not isinstance(wit, dict):
+            raise BinaryFormatError('Witness must be an object')
+        extra = {k: v for k, v in wit.items() if k not in ('id', 'siglum', 'label', 'sections')}
+        row = [
+            _string_or_extra(wit, 'id', extra, strings),
+            _string_or_extra(wit, 'siglum', extra, strings),
+            _string_or_extra(wit, 'label', extra, strings),
+        ]
+        sections = wit.get('sections', [])
+        if not isinstance(sections, list) or not all(isinstance(sec, dict) for sec in sections):
+            extra['sections'] = sections
+            sections = []
+        # Eine Anzahl von NONE bedeutet: Schlüssel fehlt im Original.
+        row += [strings.add(_compact(extra)) if extra else NONE, len(sec_rows) // _SECTION_COLS,
+                len(sections) if 'sections' in wit and 'sections' not in extra else NONE]
+        wit_rows.extend(row)
+
+        for sec in sections:
+            sec_extra = {k: v for k, v in sec.items() if k not in ('id', 'order_no', 'type', 'tokens')}
+            sec_row = [
+                _string_or_extra(sec, 'id', sec_extra, strings),
+                _int_or_extra(sec, 'order_no', sec_extra),
+                _string_or_extra(sec, 'type', sec_extra, strings),
+            ]
+            tokens = sec.get('tokens', [])
+            if not isinstance(tokens, list) or not all(isinstance(tok, dict) for tok in tokens):
+                sec_extra['tokens'] = tokens
+                tokens = []
+            sec_row += [strings.add(_compact(sec_extra)) if sec_extra else NONE, len(tok_rows) // _TOKEN_COLS,
+                        len(tokens) if 'tokens' in sec and 'tokens' not in sec_extra else NONE]
+            sec_rows.extend(sec_row)
+
+            for tok in tokens:
+                tok_extra = {k: v for k, v in tok.items()
+                             if k not in ('id', 'text', 'position', 'bbox', 'baseline')}
+                tok_id = _string_or_extra(tok, 'id', tok_extra, strings)
+                text = _string_or_extra(tok, 'text', tok_extra, strings)
+                position = _int_or_extra(tok, 'position', tok_extra)
+                flags = 0
+                bbox = tok.get('bbox')
+                if (isinstance(bbox, dict) and list(bbox) == list(_BBOX_KEYS)
+                        and all(_is_coordinate(bbox[k]) for k in _BBOX_KEYS)):
+                    coords.extend(bbox[k] for k in _BBOX_KEYS)
+                    flags |= _FLAG_BBOX
+                    for key, bit in zip(_BBOX_KEYS, _FLAG_FLOAT):
+                        if isinstance(bbox[key], float):
+                            flags |= bit
+                else:
+                    coords.extend((0, 0, 0, 0))
+                    if 'bbox' in tok:
+                        tok_extra['bbox'] = bbox
+                baseline = tok.get('baseline')
+                bl_start, bl_count = NONE, NONE
+                if isinstance(baseline, list) and all(_is_int32(v) for v in baseline):
+                    bl_start, bl_count = len(baselines), len(baseline)
+                    baselines.extend(baseline)
+                elif 'baseline' in tok:
+                    tok_extra['baseline'] = baseline
+                tok_rows.extend((tok_id, text, position,
+                                 strings.add(_compact(tok_extra)) if tok_extra else NONE,
+                                 bl_start, bl_count, flags))
+
+    # Ganzzahlige Koordinaten (der Normalfall bei Pixelangaben) als int32,
+    # sonst als float64; die Float-Bits im Token stellen den Typ wieder her.
+    coord_code = b'i' if all(_is_int32(v) for v in coords) else b'd'
+    coord_array = array(coord_code.decode('ascii'), coords)
+
+    blocks = [strings.offsets, bytes(strings.data), wit_rows, sec_rows, tok_rows, coord_array, baselines]
+    payload = []
+    for block in blocks:
+        if isinstance(block, array):
+            if sys.byteorder != 'little':
+                block = array(block.typecode, block)
+                block.byteswap()
+            block = block.tobytes()
+        payload.append(block)
+
+    header_fields = []
+    offset = _HEADER.size
+    for block in payload:
+        offset = (offset + 7) & ~7
+        header_fields += [offset, len(block)]
+        offset += len(block)
+
+    out = bytearray(_HEADER.pack(MAGIC, VERSION, coord_code, *header_fields))
+    for block, start in zip(payload, header_fields[::2]):
+        out += b'\0' * (start - len(out))
+        out += block
+    return bytes(out)
+
+
+def _column(buf, offset: int, length: int, typecode: str):
+    """Liefert eine typisierte Sicht auf einen Block ohne Kopie (auf little-endian)."""
+    view = memoryview(buf)[offset:offset + length]
+    if sys.byteorder != 'little':
+        arr = array(typecode)
+        arr.frombytes(view)
+        arr.byteswap()
+        view = memoryview(arr).cast('B')
+    return view.cast(typecode)
+
+
+class WitnessArchive:
+    """
+    Lesezugriff auf ``.epeb``-Daten.
+
+    Der Konstruktor liest nur den Header; Zeichenketten, Abschnitte und Tokens
+    werden erst beim Zugriff dekodiert. ``open`` bildet eine Datei per ``mmap``
+    ab, ``from_bytes`` arbeitet auf einem bereits geladenen Puffer (z. B. einem
+    Request-Body).
+    """
+
+    def __init__(self, buf, _mmap: Optional[mmap.mmap] = None):
+        self._mmap = _mmap
+        self._buf = memoryview(buf)
+        if len(self._buf) < _HEADER.size:
+            raise BinaryFormatError('File too short')
+        fields = _HEADER.unpack_from(self._buf, 0)
+        magic, version, coord_code = fields[:3]
+        if magic != MAGIC:
+            raise BinaryFormatError('Not an EPEB file')
+        if version != VERSION:
+            raise BinaryFormatError(f'Unsupported EPEB version {version}')
+        if coord_code not in (b'i', b'd'):
+            raise BinaryFormatError('Invalid coordinate type')
+        spans = dict(zip(_BLOCKS, zip(fields[3::2], fields[4::2])))
+        for start, length in spans.values():
+            if start + length > len(self._buf):
+                raise BinaryFormatError('Truncated EPEB file')
+        itemsize = {'I': 4, 'i': 4, 'd': 8}
+
+        def col(name, typecode, width=1):
+            start, length = spans[name]
+            if length % (width * itemsize[typecode]):
+                raise BinaryFormatError(f'Corrupt block {name}')
+            return _column(self._buf, start, length, typecode)
+
+        self._str_offsets = col('str_offsets', 'I')
+        start, length = spans['str_data']
+        self._str_data = self._buf[start:start + length]
+        self._witnesses = col('witnesses', 'i', _WITNESS_COLS)
+        self._sections = col('sections', 'i', _SECTION_COLS)
+        self._tokens = col('tokens', 'i', _TOKEN_COLS)
+        self._coords = col('coords', coord_code.decode('ascii'), 4)
+        self._baselines = col('baselines', 'i')
+        self._n_witnesses = len(self._witnesses) // _WITNESS_COLS
+        self._n_sections = len(self._sections) // _SECTION_COLS
+        self._n_tokens = len(self._tokens) // _TOKEN_COLS
+        self._n_strings = len(self._str_offsets) - 1
+        if self._n_strings < 0:
+            raise BinaryFormatError('Corrupt block str_offsets')
+        if len(self._coords) != self._n_tokens * 4:
+            raise BinaryFormatError('Corrupt block coords')
+        self._index: Optional[Dict[str, int]] = None
+
+    @classmethod
+    def open(cls, path: str) -> 'WitnessArchive':
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                raise BinaryFormatError('File too short')
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mm, _mmap=mm)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'WitnessArchive':
+        return cls(data)
+
+    def close(self) -> None:
+        """Gibt alle Sichten und ggf. das ``mmap`` frei."""
+        for name in ('_str_offsets', '_str_data', '_witnesses', '_sections',
+                     '_tokens', '_coords', '_baselines', '_buf'):
+            view = getattr(self, name, None)
+            if isinstance(view, memoryview):
+                view.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return self._n_witnesses
+
+    # -- Hilfsfunktionen ---------------------------------------------------
+
+    # Die Daten können aus einem Request-Body stammen: Jeder Verweis innerhalb
+    # der Datei wird geprüft und führt bei Fehlern zu BinaryFormatError.
+
+    def _string(self, idx: int) -> Optional[str]:
+        if idx == NONE:
+            return None
+        if not 0 <= idx < self._n_strings:
+            raise BinaryFormatError('String index out of range')
+        start, end = self._str_offsets[idx], self._str_offsets[idx + 1]
+        if not start <= end <= len(self._str_data):
+            raise BinaryFormatError('Corrupt string table')
+        try:
+            return str(self._str_data[start:end], 'utf-8')
+        except UnicodeDecodeError:
+            raise BinaryFormatError('Invalid UTF-8 in string table') from None
+
+    def _extra(self, idx: int) -> Dict[str, Any]:
+        if idx == NONE:
+            return {}
+        try:
+            extra = json.loads(self._string(idx))
+        except (ValueError, RecursionError):
+            raise BinaryFormatError('Invalid extra JSON') from None
+        if not isinstance(extra, dict):
+            raise BinaryFormatError('Extra JSON must be an object')
+        return extra
+
+    @staticmethod
+    def _check_range(start: int, count: int, limit: int, what: str) -> None:
+        """Prüft einen Verweis ``start:start + count`` auf einen Block der Länge ``limit``."""
+        if count != NONE and not (0 <= count and 0 <= start and start + count <= limit):
+            raise BinaryFormatError(f'{what} range out of bounds')
+
+    def _check(self, value: int, limit: int, what: str) -> int:
+        if not 0 <= value < limit:
+            raise IndexError(f'{what} index out of range')
+        return value
+
+    def _wit_row(self, wi: int) -> List[int]:
+        self._check(wi, len(self), 'Witness')
+        base = wi * _WITNESS_COLS
+        row = self._witnesses[base:base + _WITNESS_COLS].tolist()
+        self._check_range(row[4], row[5], self._n_sections, 'Section')
+        return row
+
+    def _sec_row(self, wi: int, si: int) -> List[int]:
+        self._check(si, self.section_count(wi), 'Section')
+        base = (self._witnesses[wi * _WITNESS_COLS + 4] + si) * _SECTION_COLS
+        row = self._sections[base:base + _SECTION_COLS].tolist()
+        self._check_range(row[4], row[5], self._n_tokens, 'Token')
+        return row
+
+    def _wit_head(self, row: List[int]) -> Dict[str, Any]:
+        wit: Dict[str, Any] = {}
+        for key, idx in zip(('id', 'siglum', 'label'), row[:3]):
+            if idx != NONE:
+                wit[key] = self._string(idx)
+        wit.update(self._extra(row[3]))
+        return wit
+
+    # -- Öffentliche API ---------------------------------------------------
+
+    def witness_ids(self) -> List[Optional[str]]:
+        return [self._string(self._witnesses[wi * _WITNESS_COLS]) for wi in range(len(self))]
+
+    def find(self, witness_id: str) -> Optional[int]:
+        """Index eines Zeugen anhand seiner ID oder ``None``."""
+        if self._index is None:
+            self._index = {wid: wi for wi, wid in enumerate(self.witness_ids())}
+        return self._index.get(witness_id)
+
+    def witness_meta(self, wi: int) -> Dict[str, Any]:
+        """Zeuge ohne Tokens; ``sections`` enthält nur ID, Typ und Tokenanzahl."""
+        meta = self._wit_head(self._wit_row(wi))
+        sections = []
+        for si in range(self.section_count(wi)):
+            sec_id, _, sec_type, _, _, count = self._sec_row(wi, si)
+            sections.append({'id': self._string(sec_id), 'type': self._string(sec_type),
+                             'token_count': max(count, 0)})
+        meta['sections'] = sections
+        return meta
+
+    def section_count(self, wi: int) -> int:
+        return max(self._wit_row(wi)[5], 0)
+
+    def find_section(self, wi: int, section_id: str) -> Optional[int]:
+        """Index eines Abschnitts innerhalb des Zeugen ``wi`` oder ``None``.
+
+        Verglichen wird wie in server.py mit ``str(sec.get('id'))``, damit
+        auch nicht-textuelle IDs (aus dem Extra-JSON) gefunden werden.
+        """
+        for si in range(self.section_count(wi)):
+            sec_id, _, _, extra, _, _ = self._sec_row(wi, si)
+            value = self._string(sec_id) if sec_id != NONE else self._extra(extra).get('id')
+            if str(value) == section_id:
+                return si
+        return None
+
+    def tokens(self, wi: int, si: int, start: int = 0, stop: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Dekodiert nur die Tokens ``start:stop`` des Abschnitts ``si`` von Zeuge ``wi``."""
+        row = self._sec_row(wi, si)
+        first, count = row[4], max(row[5], 0)
+        begin, end, _ = slice(start, stop).indices(count)
+        return [self._token(first + ti) for ti in range(begin, end)]
+
+    def _token(self, ti: int) -> Dict[str, Any]:
+        base = ti * _TOKEN_COLS
+        tok_id, text, position, extra, bl_start, bl_count, flags = self._tokens[base:base + _TOKEN_COLS].tolist()
+        tok: Dict[str, Any] = {}
+        if tok_id != NONE:
+            tok['id'] = self._string(tok_id)
+        if text != NONE:
+            tok['text'] = self._string(text)
+        if position != NONE:
+            tok['position'] = position
+        if flags & _FLAG_BBOX:
+            values = self._coords[ti * 4:ti * 4 + 4].tolist()
+            try:
+                tok['bbox'] = {key: float(value) if flags & bit else int(value)
+                               for key, value, bit in zip(_BBOX_KEYS, values, _FLAG_FLOAT)}
+            except (ValueError, OverflowError):
+                raise BinaryFormatError('Invalid coordinate') from None
+        self._check_range(bl_start, bl_count, len(self._baselines), 'Baseline')
+        if bl_count != NONE:
+            tok['baseline'] = self._baselines[bl_start:bl_start + bl_count].tolist()
+        tok.update(self._extra(extra))
+        return tok
+
+    def section(self, wi: int, si: int) -> Dict[str, Any]:
+        """Dekodiert einen vollständigen Abschnitt einschließlich Tokens."""
+        sec_id, order_no, sec_type, extra, _, count = self._sec_row(wi, si)
+        sec: Dict[str, Any] = {}
+        if sec_id != NONE:
+            sec['id'] = self._string(sec_id)
+        if order_no != NONE:
+            sec['order_no'] = order_no
+        if sec_type != NONE:
+            sec['type'] = self._string(sec_type)
+        sec.update(self._extra(extra))
+        if count != NONE:
+            sec['tokens'] = self.tokens(wi, si)
+        return sec
+
+    def witness(self, wi: int) -> Dict[str, Any]:
+        """Dekodiert einen vollständigen Zeugen in die JSON-Struktur."""
+        row = self._wit_row(wi)
+        wit = self._wit_head(row)
+        if row[5] != NONE:
+            wit['sections'] = [self.section(wi, si) for si in range(row[5])]
+        return wit
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        return [self.witness(wi) for wi in range(len(self))]
+
+
+def decode_witnesses(data: bytes) -> List[Dict[str, Any]]:
+    """Dekodiert einen ``.epeb``-Puffer vollständig in eine Liste von Zeugen."""
+    archive = WitnessArchive.from_bytes(data)
+    try:
+        return archive.to_list()
+    finally:
+        archive.close()
+
+
+def json_to_binary(json_path: str, binary_path: str) -> None:
+    """Konvertiert eine bestehende JSON-Datei (Liste oder einzelner Zeuge)."""
+    with open(json_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = [data]
+    payload = encode_witnesses(data)
+    with open(binary_path, 'wb') as f:
+        f.write(payload)
+
+
+def binary_to_json(binary_path: str, json_path: str) -> None:
+    with WitnessArchive.open(binary_path) as archive:
+        data = archive.to_list()
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def _best_of(func, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark(witnesses: List[Dict[str, Any]], repeat: int = 5) -> Dict[str, Any]:
+    """Vergleicht Größe und Parse-Zeit von JSON und ``.epeb`` für dieselben Daten."""
+    pretty = json.dumps(witnesses, ensure_ascii=False, indent=2).encode('utf-8')
+    compact = json.dumps(witnesses, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    binary = encode_witnesses(witnesses)
+    # json.dumps statt ==, da 1 == 1.0 einen int/float-Wechsel verdecken würde;
+    # sort_keys, weil der Decoder die Schlüssel in fester Reihenfolge aufbaut
+    if (json.dumps(decode_witnesses(binary), sort_keys=True)
+            != json.dumps(witnesses, sort_keys=True)):
+        raise BinaryFormatError('Round trip mismatch')
+
+    def open_and_slice():
+        archive = WitnessArchive.from_bytes(binary)
+        if len(archive) and archive.section_count(0):
+            archive.tokens(0, 0, 0, 50)
+        archive.close()
+
+    return {
+        'size_bytes': {'json_indent2': len(pretty), 'json_compact': len(compact), 'epeb': len(binary)},
+        'seconds': {
+            'json_indent2_parse': _best_of(lambda: json.loads(pretty), repeat),
+            'json_compact_parse': _best_of(lambda: json.loads(compact), repeat),
+            'epeb_encode': _best_of(lambda: encode_witnesses(witnesses), repeat),
+            'epeb_full_decode': _best_of(lambda: decode_witnesses(binary), repeat),
+            'epeb_open_and_slice': _best_of(open_and_slice, repeat),
+        },
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Konverter für das EPEB-Binärformat.')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('to-binary', help='JSON -> EPEB')
+    p.add_argument('source')
+    p.add_argument('target')
+    p = sub.add_parser('to-json', help='EPEB -> JSON')
+    p.add_argument('source')
+    p.add_argument('target')
+    p = sub.add_parser('bench', help='Größe und Parse-Zeit gegenüber JSON messen')
+    p.add_argument('source', help='JSON-Datei mit Zeugen')
+    p.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    if args.command == 'to-binary':
+        json_to_binary(args.source, args.target)
+    elif args.command == 'to-json':
+        binary_to_json(args.source, args.target)
+    else:
+        with open(args.source, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            data = [data]
+        print(json.dumps(benchmark(data, args.repeat), indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -18,6 +18,8 @@ import socketserver
 import json
 import datetime
 
+from epe.binformat import BinaryFormatError, WitnessArchive, decode_witnesses, encode_witnesses
+
 PORT = 8000
 
 # Globale Zeugenliste, wird beim Start eingelesen.
@@ -31,12 +33,62 @@ next_annotation_id = 1
 # Jede Gruppe ist ein Dict von witness_id -> token_id.
 alignment_groups = []
 
+# Binärer Schnappschuss der Zeugen (data/witnesses.epeb), per mmap geöffnet.
+witness_archive = None
+
 
 def find_witness_by_id(witness_id: str):
     """Hilfsfunktion, um einen Zeugen anhand seiner ID zu finden."""
     return next((wit for wit in witnesses if wit['id'] == witness_id), None)
 
 
+def find_token_by_id(wit, tid):
+    """Sucht ein Token anhand seiner ID in allen Abschnitten eines Zeugen."""
+    if not tid:
+        return None
+    for sec in wit.get('sections', []):
+        for tok in sec.get('tokens', []):
+            if tok.get('id') == tid:
+                return tok
+    return None
+
+
+def build_alignments(base_id, witness_id, base, other, base_sec, other_sec):
+    """Berechnet die Alignment-Zeilen zwischen Basetext und Zeuge.
+
+    Sind Alignment-Gruppen importiert, werden diese verwendet, andernfalls
+    werden die Tokens der beiden Abschnitte positionsweise gegenübergestellt.
+    """
+    alignments = []
+    if alignment_groups:
+        # Alignment anhand der importierten Gruppen
+        group_pos = 1
+        for group in alignment_groups:
+            # Finde Token für Base und Witness
+            base_tok = find_token_by_id(base, group.get(base_id))
+            other_tok = find_token_by_id(other, group.get(witness_id))
+            alignments.append({
+                'position': group_pos,
+                'base': base_tok or {'id': None, 'text': '[—]'},
+                'witness': other_tok or {'id': None, 'text': '[—]'}
+            })
+            group_pos += 1
+    else:
+        # Einfaches Alignment: Positionen matchen
+        base_tokens = base_sec.get('tokens', [])
+        other_tokens = other_sec.get('tokens', [])
+        max_len = max(len(base_tokens), len(other_tokens))
+        for idx in range(max_len):
+            base_tok = base_tokens[idx] if idx < len(base_tokens) else None
+            other_tok = other_tokens[idx] if idx < len(other_tokens) else None
+            alignments.append({
+                'position': idx + 1,
+                'base': base_tok or {'id': None, 'text': '[—]'},
+                'witness': other_tok or {'id': None, 'text': '[—]'}
+            })
+    return alignments
+
+
 def load_witnesses():
     """Lädt die Daten aus der JSON-Datei in die globale Liste."""
     global witnesses
@@ -46,6 +98,30 @@ def load_witnesses():
             witnesses = json.load(f)
     except FileNotFoundError:
         witnesses = []
+    refresh_witness_archive()
+
+
+def refresh_witness_archive():
+    """Schreibt den Binär-Schnappschuss neu und bildet ihn per mmap ab.
+
+    Der Schnappschuss ist nur ein Cache von witnesses.json: Schlägt das
+    Schreiben fehl, wird der Fehler geloggt und ohne Schnappschuss
+    weitergearbeitet.
+    """
+    global witness_archive
+    data_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'witnesses.epeb')
+    tmp_path = data_path + '.tmp'
+    # Altes Mapping erst schließen, dann ersetzen (sonst scheitert os.replace unter Windows)
+    if witness_archive is not None:
+        witness_archive.close()
+        witness_archive = None
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(encode_witnesses(witnesses))
+        os.replace(tmp_path, data_path)
+        witness_archive = WitnessArchive.open(data_path)
+    except Exception as exc:
+        write_log('-', data_path, 500, f'Snapshot refresh failed: {exc}')
 
 
 def load_annotations():
@@ -91,6 +167,7 @@ def save_witnesses():
     data_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'witnesses.json')
     with open(data_path, 'w', encoding='utf-8') as f:
         json.dump(witnesses, f, ensure_ascii=False, indent=2)
+    refresh_witness_archive()
 
 
 def write_log(method: str, path: str, status: int, message: str = '') -> None:
@@ -130,6 +207,8 @@ class RequestHandler(http.server.SimpleHTTPRequestHandler):
         parsed_path = self.path
         if parsed_path == '/api/witnesses':
             self.handle_api_post_witness()
+        elif parsed_path == '/api/import/epeb':
+            self.handle_api_import_binary()
         elif parsed_path == '/api/annotations':
             self.handle_api_post_annotation()
         elif parsed_path == '/api/alignments/import':
@@ -282,6 +361,10 @@ class RequestHandler(http.server.SimpleHTTPRequestHandler):
             self.wfile.write(json.dumps(meta, ensure_ascii=False).encode('utf-8'))
             write_log(self.command, self.path, 200)
             return
+        parts = path.split('/')
+        if len(parts) == 5 and parts[2] == 'witnesses' and parts[4] == 'tokens':
+            self.handle_api_get_token_slice(path)
+            return
         if path.startswith('/api/witnesses/'):
             witness_id = path.split('/')[-1]
             w = next((wit for wit in witnesses if wit['id'] == witness_id), None)
@@ -328,43 +411,7 @@ class RequestHandler(http.server.SimpleHTTPRequestHandler):
                 self.send_error(404, 'Section not found')
                 write_log(self.command, self.path, 404, 'Section not found')
                 return
-            alignments = []
-            if alignment_groups:
-                # Alignment anhand der importierten Gruppen
-                group_pos = 1
-                for group in alignment_groups:
-                    # Finde Token für Base und Witness
-                    base_tok_id = group.get(base_id)
-                    wit_tok_id = group.get(witness_id)
-                    def find_token_by_id(wit, tid):
-                        if not tid:
-                            return None
-                        for sec in wit.get('sections', []):
-                            for tok in sec.get('tokens', []):
-                                if tok.get('id') == tid:
-                                    return tok
-                        return None
-                    base_tok = find_token_by_id(base, base_tok_id)
-                    other_tok = find_token_by_id(other, wit_tok_id)
-                    alignments.append({
-                        'position': group_pos,
-                        'base': base_tok or {'id': None, 'text': '[—]'},
-                        'witness': other_tok or {'id': None, 'text': '[—]'}
-                    })
-                    group_pos += 1
-            else:
-                # Einfaches Alignment: Positionen matchen
-                base_tokens = base_sec.get('tokens', [])
-                other_tokens = other_sec.get('tokens', [])
-                max_len = max(len(base_tokens), len(other_tokens))
-                for idx in range(max_len):
-                    base_tok = base_tokens[idx] if idx < len(base_tokens) else None
-                    other_tok = other_tokens[idx] if idx < len(other_tokens) else None
-                    alignments.append({
-                        'position': idx + 1,
-                        'base': base_tok or {'id': None, 'text': '[—]'},
-                        'witness': other_tok or {'id': None, 'text': '[—]'}
-                    })
+            alignments = build_alignments(base_id, witness_id, base, other, base_sec, other_sec)
             resp = {'alignments': alignments}
             self.send_response(200)
             self.send_header('Content-Type', 'application/json; charset=utf-8')
@@ -395,10 +442,24 @@ class RequestHandler(http.server.SimpleHTTPRequestHandler):
                 self.send_error(404, 'Witness not found')
                 write_log(self.command, self.path, 404, 'Witness not found')
                 return
-            content = json.dumps(w, ensure_ascii=False, indent=2).encode('utf-8')
+            from urllib.parse import urlparse, parse_qs
+            qs = parse_qs(urlparse(self.path).query)
+            fmt = qs.get('format', ['json'])[0]
+            if fmt == 'epeb':
+                content = encode_witnesses([w])
+                content_type = 'application/octet-stream'
+                filename = f'witness_{witness_id}.epeb'
+            elif fmt == 'json':
+                content = json.dumps(w, ensure_ascii=False, indent=2).encode('utf-8')
+                content_type = 'application/json; charset=utf-8'
+                filename = f'witness_{witness_id}.json'
+            else:
+                self.send_error(400, 'Unsupported export format')
+                write_log(self.command, self.path, 400, 'Unsupported export format')
+                return
             self.send_response(200)
-            self.send_header('Content-Type', 'application/json; charset=utf-8')
-            self.send_header('Content-Disposition', f'attachment; filename="witness_{witness_id}.json"')
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Disposition', f'attachment; filename="{filename}"')
             self.send_header('Content-Length', str(len(content)))
             self.end_headers()
             self.wfile.write(content)
@@ -498,6 +559,88 @@ class RequestHandler(http.server.SimpleHTTPRequestHandler):
         self.end_headers()
         write_log(self.command, self.path, 201, f"Imported witness {data['id']}")
 
+    def handle_api_get_token_slice(self, path):
+        """Liefert einen Token-Bereich direkt aus dem mmap-Schnappschuss.
+
+        Fehlt der Schnappschuss (z. B. nach einem Schreibfehler), wird der
+        Bereich aus der Zeugenliste im Speicher geschnitten.
+        """
+        from urllib.parse import urlparse, parse_qs
+        witness_id = path.split('/')[3]
+        qs = parse_qs(urlparse(self.path).query)
+        sec_id = qs.get('section', [None])[0]
+        try:
+            start = int(qs.get('start', ['0'])[0])
+            stop_str = qs.get('stop', [None])[0]
+            stop = int(stop_str) if stop_str is not None else None
+        except ValueError:
+            self.send_error(400, 'Invalid start or stop')
+            write_log(self.command, self.path, 400, 'Invalid start or stop')
+            return
+        tokens = None
+        if witness_archive is not None:
+            wi = witness_archive.find(witness_id)
+            if wi is None:
+                self.send_error(404, 'Witness not found')
+                write_log(self.command, self.path, 404, 'Witness not found')
+                return
+            if sec_id:
+                si = witness_archive.find_section(wi, sec_id)
+            else:
+                si = 0 if witness_archive.section_count(wi) else None
+            if si is not None:
+                tokens = witness_archive.tokens(wi, si, start, stop)
+        else:
+            w = find_witness_by_id(witness_id)
+            if not w:
+                self.send_error(404, 'Witness not found')
+                write_log(self.command, self.path, 404, 'Witness not found')
+                return
+            sections = w.get('sections') if isinstance(w.get('sections'), list) else []
+            sections = [sec for sec in sections if isinstance(sec, dict)]
+            if sec_id:
+                sec = next((sec for sec in sections if str(sec.get('id')) == sec_id), None)
+            else:
+                sec = sections[0] if sections else None
+            if sec is not None:
+                sec_tokens = sec.get('tokens')
+                tokens = sec_tokens[start:stop] if isinstance(sec_tokens, list) else []
+        if tokens is None:
+            self.send_error(404, 'Section not found')
+            write_log(self.command, self.path, 404, 'Section not found')
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.end_headers()
+        self.wfile.write(json.dumps({'tokens': tokens}, ensure_ascii=False).encode('utf-8'))
+        write_log(self.command, self.path, 200)
+
+    def handle_api_import_binary(self):
+        """Importiert einen oder mehrere Zeugen aus einer .epeb-Datei im Request-Body."""
+        content_length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(content_length)
+        try:
+            imported = decode_witnesses(body)
+        except BinaryFormatError:
+            self.send_error(400, 'Invalid EPEB data')
+            write_log(self.command, self.path, 400, 'Invalid EPEB data')
+            return
+        # Gleiche Minimalvalidierung wie beim JSON-Import
+        if not imported or not all(isinstance(w.get('id'), str) and 'label' in w for w in imported):
+            self.send_error(400, 'Missing required fields')
+            write_log(self.command, self.path, 400, 'Missing required fields')
+            return
+        ids = [w['id'] for w in imported]
+        if len(set(ids)) != len(ids) or any(w['id'] in ids for w in witnesses):
+            self.send_error(400, 'Witness ID already exists')
+            write_log(self.command, self.path, 400, 'Witness ID exists')
+            return
+        witnesses.extend(imported)
+        save_witnesses()
+        self.send_response(201)
+        self.end_headers()
+        write_log(self.command, self.path, 201, f"Imported witnesses {', '.join(ids)}")
+
     def handle_api_import_alignment(self):
         """Importiert Alignment-Gruppen aus einer CSV-Datei."""
         global alignment_groups
@@ -0,0 +1,204 @@
+"""
+Tests für das Binärformat in ``epe/binformat.py``.
+
+Ausführen aus dem Verzeichnis ``prototype_with_logging``:
+    python -m unittest discover tests
+"""
+
+import json
+import os
+import struct
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from epe.binformat import (  # noqa: E402
+    NONE, BinaryFormatError, WitnessArchive, benchmark, binary_to_json, decode_witnesses,
+    encode_witnesses, json_to_binary,
+)
+
+
+def sample():
+    return [
+        {
+            'id': 'w1', 'siglum': 'MS_001', 'label': 'MS_001 – folio 42r',
+            'metadata': {'language': 'ar'},
+            'sections': [
+                {'id': 'sec1', 'order_no': 1, 'type': 'page', 'tokens': [
+                    {'id': 'w1t1', 'text': 'بسم', 'position': 1,
+                     'bbox': {'x': 100, 'y': 200, 'width': 50, 'height': 20}, 'baseline': [1, 2, 3]},
+                    {'id': 'w1t2', 'text': 'الله', 'position': 2,
+                     'bbox': {'x': 160, 'y': 200, 'width': 60, 'height': 20}},
+                ]},
+                {'id': 'sec2', 'order_no': 2, 'type': 'page', 'tokens': [
+                    {'id': 'w1t3', 'text': 'بسم', 'position': 1,
+                     'bbox': {'x': 100, 'y': 230, 'width': 50, 'height': 20}},
+                ]},
+            ],
+        },
+        {'id': 'w2', 'siglum': 'MS_002', 'label': 'MS_002', 'sections': []},
+    ]
+
+
+def header_span(data, block):
+    """Liefert (Offset, Länge) eines Blocks aus dem Header."""
+    offset = 4 + 2 + 2 + block * 16
+    return struct.unpack_from('<QQ', data, offset)
+
+
+class RoundTripTests(unittest.TestCase):
+
+    def assertRoundTrip(self, witnesses):
+        # json.dumps statt ==, damit ein Wechsel zwischen int und float auffällt
+        decoded = decode_witnesses(encode_witnesses(witnesses))
+        self.assertEqual(json.dumps(decoded, sort_keys=True), json.dumps(witnesses, sort_keys=True))
+
+    def test_sample(self):
+        self.assertRoundTrip(sample())
+
+    def test_empty(self):
+        self.assertRoundTrip([])
+
+    def test_mixed_int_and_float_bboxes(self):
+        witnesses = [{'id': 'w', 'sections': [{'id': 's', 'tokens': [
+            {'bbox': {'x': 1, 'y': 2, 'width': 3, 'height': 4}},
+            {'bbox': {'x': 1.5, 'y': 2, 'width': 3.0, 'height': 4}},
+            {'bbox': {'x': 2 ** 40, 'y': 2, 'width': 3, 'height': 4}},
+            {'bbox': {'x': True, 'y': 2, 'width': 3, 'height': 4}},
+            {'bbox': {'y': 2, 'x': 1, 'width': 3, 'height': 4}},
+        ]}]}]
+        self.assertRoundTrip(witnesses)
+        tokens = decode_witnesses(encode_witnesses(witnesses))[0]['sections'][0]['tokens']
+        self.assertIsInstance(tokens[0]['bbox']['x'], int)
+        self.assertIsInstance(tokens[1]['bbox']['y'], int)
+        self.assertIsInstance(tokens[1]['bbox']['width'], float)
+
+    def test_non_object_sections_and_tokens(self):
+        self.assertRoundTrip([
+            {'id': 'a', 'label': 'A', 'sections': [1]},
+            {'id': 'b', 'label': 'B', 'sections': [{'id': 's', 'tokens': ['x', {'id': 't'}]}]},
+            {'id': 'c', 'label': 'C', 'sections': 'none'},
+            {'id': 'd', 'label': 'D', 'sections': [{'id': 's', 'tokens': None}]},
+        ])
+
+    def test_missing_and_none_keys(self):
+        self.assertRoundTrip([
+            {'id': 'a'},
+            {'id': None, 'label': None, 'siglum': 5, 'sections': [
+                {'order_no': None, 'type': None},
+                {'id': 's', 'order_no': 1.5, 'tokens': [
+                    {},
+                    {'id': None, 'text': None, 'position': None, 'bbox': None, 'baseline': None},
+                    {'baseline': [[1, 2], [3, 4]], 'extra': True},
+                    {'baseline': []},
+                ]},
+            ]},
+        ])
+
+
+class ArchiveTests(unittest.TestCase):
+
+    def test_slices_and_lookup(self):
+        archive = WitnessArchive.from_bytes(encode_witnesses(sample()))
+        try:
+            self.assertEqual(len(archive), 2)
+            self.assertEqual(archive.witness_ids(), ['w1', 'w2'])
+            wi = archive.find('w1')
+            si = archive.find_section(wi, 'sec1')
+            self.assertEqual([t['id'] for t in archive.tokens(wi, si, 1, 2)], ['w1t2'])
+            self.assertEqual(archive.witness_meta(wi)['sections'][1],
+                             {'id': 'sec2', 'type': 'page', 'token_count': 1})
+            self.assertIsNone(archive.find('missing'))
+            self.assertEqual(archive.section_count(archive.find('w2')), 0)
+        finally:
+            archive.close()
+
+    def test_find_section_with_non_string_id(self):
+        archive = WitnessArchive.from_bytes(encode_witnesses([
+            {'id': 'w', 'sections': [{'id': 'a', 'tokens': []}, {'id': 1, 'tokens': [{'id': 't'}]}]}]))
+        try:
+            self.assertEqual(archive.find_section(0, '1'), 1)
+            self.assertEqual(archive.find_section(0, 'a'), 0)
+            self.assertIsNone(archive.find_section(0, '2'))
+        finally:
+            archive.close()
+
+    def test_file_conversion(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            src = os.path.join(tmp, 'witnesses.json')
+            with open(src, 'w', encoding='utf-8') as f:
+                json.dump(sample(), f, ensure_ascii=False)
+            json_to_binary(src, os.path.join(tmp, 'w.epeb'))
+            binary_to_json(os.path.join(tmp, 'w.epeb'), os.path.join(tmp, 'back.json'))
+            with open(os.path.join(tmp, 'back.json'), encoding='utf-8') as f:
+                self.assertEqual(json.load(f), sample())
+
+
+class BenchmarkTests(unittest.TestCase):
+
+    def test_keys_out_of_order(self):
+        witnesses = [{'label': 'A', 'id': 'a', 'sections': [
+            {'tokens': [{'text': 'x', 'bbox': {'x': 1, 'y': 2, 'width': 3, 'height': 4.5}, 'id': 't'}],
+             'type': 'page', 'id': 's'}]}]
+        result = benchmark(witnesses, repeat=1)
+        self.assertGreater(result['size_bytes']['epeb'], 0)
+
+
+class CorruptInputTests(unittest.TestCase):
+
+    def assertRejected(self, data):
+        with self.assertRaises(BinaryFormatError):
+            decode_witnesses(bytes(data))
+
+    def test_truncated_and_garbled_header(self):
+        data = encode_witnesses(sample())
+        self.assertRejected(b'')
+        self.assertRejected(data[:10])
+        self.assertRejected(b'XXXX' + data[4:])
+        self.assertRejected(data[:4] + b'\x63\x00' + data[6:])
+        self.assertRejected(data[:6] + b'q' + data[7:])
+        self.assertRejected(data[:len(data) // 2])
+
+    def test_extra_must_be_object(self):
+        data = encode_witnesses([{'id': 'a', 'label': 'b', 'x': 1}])
+        self.assertRejected(data.replace(b'{"x":1}', b'1234567'))
+        self.assertRejected(data.replace(b'{"x":1}', b'{"x":1,'))
+
+    def test_string_index_out_of_range(self):
+        data = bytearray(encode_witnesses(sample()))
+        start, _ = header_span(data, 2)
+        for bad in (10 ** 6, -1, -5):
+            corrupt = bytearray(data)
+            struct.pack_into('<i', corrupt, start, bad)
+            self.assertRejected(corrupt)
+        # NONE bleibt erlaubt und bedeutet "Schlüssel fehlt"
+        corrupt = bytearray(data)
+        struct.pack_into('<i', corrupt, start, NONE)
+        self.assertNotIn('id', decode_witnesses(bytes(corrupt))[0])
+
+    def test_section_and_token_ranges_out_of_bounds(self):
+        data = encode_witnesses(sample())
+        wit_start, _ = header_span(data, 2)
+        sec_start, _ = header_span(data, 3)
+        tok_start, _ = header_span(data, 4)
+        cases = [
+            (wit_start + 4 * 4, -1),        # section_start
+            (wit_start + 5 * 4, 100),       # section_count
+            (sec_start + 4 * 4, 1000),      # token_start
+            (sec_start + 5 * 4, -3),        # token_count
+            (tok_start + 4 * 4, 999),       # baseline_start
+        ]
+        for offset, value in cases:
+            corrupt = bytearray(data)
+            struct.pack_into('<i', corrupt, offset, value)
+            self.assertRejected(corrupt)
+
+    def test_invalid_utf8(self):
+        data = encode_witnesses([{'id': 'abc', 'label': 'x'}])
+        self.assertRejected(data.replace(b'abc', b'\xff\xfe\xfd'))
+
+
+if __name__ == '__main__':
+    unittest.main()
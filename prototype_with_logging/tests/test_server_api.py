@@ -0,0 +1,182 @@
+"""
+Tests für die EPEB-Endpunkte in ``server.py``.
+
+Der Server wird aus einer Kopie in einem temporären Verzeichnis geladen, damit
+die Daten unter ``data/`` unverändert bleiben, und auf einem freien Port in
+einem Hintergrund-Thread gestartet.
+
+Ausführen aus dem Verzeichnis ``prototype_with_logging``:
+    python -m unittest discover tests
+"""
+
+import http.client
+import importlib.util
+import json
+import os
+import shutil
+import socketserver
+import sys
+import tempfile
+import threading
+import unittest
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from epe.binformat import decode_witnesses, encode_witnesses  # noqa: E402
+
+WITNESSES = [
+    {'id': 'w1', 'siglum': 'MS_001', 'label': 'MS_001', 'sections': [
+        {'id': 'sec1', 'order_no': 1, 'type': 'page', 'tokens': [
+            {'id': 'w1t1', 'text': 'بسم', 'position': 1, 'bbox': {'x': 100, 'y': 200, 'width': 50, 'height': 20}},
+            {'id': 'w1t2', 'text': 'الله', 'position': 2, 'bbox': {'x': 160, 'y': 200, 'width': 60, 'height': 20}},
+            {'id': 'w1t3', 'text': 'الرحمن', 'position': 3, 'bbox': {'x': 230, 'y': 200, 'width': 70, 'height': 20}},
+        ]},
+        {'id': 1, 'order_no': 2, 'type': 'page', 'tokens': [{'id': 'w1t4', 'text': 'رب'}]},
+    ]},
+    {'id': 'tokens', 'label': 'Zeuge mit der ID "tokens"', 'sections': []},
+]
+
+
+class ServerApiTests(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.mkdtemp(prefix='epe_server_test_')
+        shutil.copy(os.path.join(BASE_DIR, 'server.py'), cls.tmp)
+        shutil.copytree(os.path.join(BASE_DIR, 'epe'), os.path.join(cls.tmp, 'epe'),
+                        ignore=shutil.ignore_patterns('__pycache__'))
+        os.makedirs(os.path.join(cls.tmp, 'data'))
+        spec = importlib.util.spec_from_file_location('server_under_test', os.path.join(cls.tmp, 'server.py'))
+        cls.srv = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(cls.srv)
+
+        class QuietHandler(cls.srv.RequestHandler):
+            def log_message(self, *args):
+                pass
+
+        cls.httpd = socketserver.TCPServer(('127.0.0.1', 0), QuietHandler)
+        cls.port = cls.httpd.server_address[1]
+        cls.thread = threading.Thread(target=cls.httpd.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.httpd.shutdown()
+        cls.httpd.server_close()
+        if cls.srv.witness_archive is not None:
+            cls.srv.witness_archive.close()
+        shutil.rmtree(cls.tmp, ignore_errors=True)
+
+    def setUp(self):
+        data_dir = os.path.join(self.tmp, 'data')
+        with open(os.path.join(data_dir, 'witnesses.json'), 'w', encoding='utf-8') as f:
+            json.dump(WITNESSES, f, ensure_ascii=False)
+        with open(os.path.join(data_dir, 'annotations.json'), 'w', encoding='utf-8') as f:
+            json.dump([], f)
+        snapshot = os.path.join(data_dir, 'witnesses.epeb')
+        if os.path.isdir(snapshot):
+            os.rmdir(snapshot)
+        self.srv.load_witnesses()
+        self.srv.load_annotations()
+
+    def request(self, method, path, body=None):
+        conn = http.client.HTTPConnection('127.0.0.1', self.port, timeout=10)
+        try:
+            conn.request(method, path, body=body)
+            resp = conn.getresponse()
+            return resp.status, resp.read()
+        finally:
+            conn.close()
+
+    # -- POST /api/import/epeb ---------------------------------------------
+
+    def test_import_binary(self):
+        body = encode_witnesses([{'id': 'w9', 'label': 'Neu', 'sections': []}])
+        status, _ = self.request('POST', '/api/import/epeb', body)
+        self.assertEqual(status, 201)
+        self.assertIsNotNone(self.srv.find_witness_by_id('w9'))
+
+    def test_import_corrupt_body(self):
+        self.assertEqual(self.request('POST', '/api/import/epeb', b'garbage')[0], 400)
+        # Extra-JSON, das kein Objekt ist, führte früher zu einem TypeError
+        crafted = encode_witnesses([{'id': 'a', 'label': 'b', 'x': 1}]).replace(b'{"x":1}', b'1234567')
+        self.assertEqual(self.request('POST', '/api/import/epeb', crafted)[0], 400)
+
+    def test_import_missing_fields(self):
+        body = encode_witnesses([{'id': 'w9', 'sections': []}])
+        self.assertEqual(self.request('POST', '/api/import/epeb', body)[0], 400)
+        body = encode_witnesses([{'label': 'ohne ID'}])
+        self.assertEqual(self.request('POST', '/api/import/epeb', body)[0], 400)
+
+    def test_import_duplicate_id(self):
+        body = encode_witnesses([{'id': 'w1', 'label': 'Doppelt'}])
+        self.assertEqual(self.request('POST', '/api/import/epeb', body)[0], 400)
+        body = encode_witnesses([{'id': 'w9', 'label': 'A'}, {'id': 'w9', 'label': 'B'}])
+        self.assertEqual(self.request('POST', '/api/import/epeb', body)[0], 400)
+        self.assertIsNone(self.srv.find_witness_by_id('w9'))
+
+    # -- GET /api/export/<id> ----------------------------------------------
+
+    def test_export_formats(self):
+        status, body = self.request('GET', '/api/export/w1?format=epeb')
+        self.assertEqual(status, 200)
+        self.assertEqual(decode_witnesses(body), [WITNESSES[0]])
+        status, body = self.request('GET', '/api/export/w1')
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body), WITNESSES[0])
+        self.assertEqual(self.request('GET', '/api/export/w1?format=xyz')[0], 400)
+
+    # -- GET /api/witnesses/<id>/tokens ------------------------------------
+
+    def test_witness_with_id_tokens(self):
+        status, body = self.request('GET', '/api/witnesses/tokens')
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body)['id'], 'tokens')
+
+    def assertSlices(self):
+        status, body = self.request('GET', '/api/witnesses/w1/tokens?section=sec1&start=1&stop=3')
+        self.assertEqual(status, 200)
+        self.assertEqual([t['id'] for t in json.loads(body)['tokens']], ['w1t2', 'w1t3'])
+        status, body = self.request('GET', '/api/witnesses/w1/tokens?section=1')
+        self.assertEqual(status, 200)
+        self.assertEqual([t['id'] for t in json.loads(body)['tokens']], ['w1t4'])
+        status, body = self.request('GET', '/api/witnesses/w1/tokens?stop=1')
+        self.assertEqual(json.loads(body)['tokens'], WITNESSES[0]['sections'][0]['tokens'][:1])
+        self.assertEqual(self.request('GET', '/api/witnesses/w1/tokens?section=nope')[0], 404)
+        self.assertEqual(self.request('GET', '/api/witnesses/missing/tokens')[0], 404)
+        self.assertEqual(self.request('GET', '/api/witnesses/w1/tokens?start=x')[0], 400)
+
+    def test_token_slice_with_snapshot(self):
+        self.assertIsNotNone(self.srv.witness_archive)
+        self.assertSlices()
+
+    def test_token_slice_without_snapshot(self):
+        self.srv.witness_archive.close()
+        self.srv.witness_archive = None
+        self.assertSlices()
+
+    # -- Schnappschuss -----------------------------------------------------
+
+    def test_non_object_sections_do_not_block_startup(self):
+        body = json.dumps({'id': 'x', 'label': 'y', 'sections': [1]}).encode('utf-8')
+        self.assertEqual(self.request('POST', '/api/witnesses', body)[0], 201)
+        self.assertEqual(self.request('PATCH', '/api/witnesses/w1', b'{"label": "neu"}')[0], 200)
+        self.srv.load_witnesses()
+        self.assertIsNotNone(self.srv.witness_archive)
+        self.assertEqual(self.srv.find_witness_by_id('x')['sections'], [1])
+
+    def test_snapshot_failure_is_soft(self):
+        snapshot = os.path.join(self.tmp, 'data', 'witnesses.epeb')
+        self.srv.witness_archive.close()
+        self.srv.witness_archive = None
+        os.remove(snapshot)
+        os.mkdir(snapshot)
+        self.srv.load_witnesses()
+        self.assertIsNone(self.srv.witness_archive)
+        self.assertEqual(self.request('PATCH', '/api/witnesses/w1', b'{"label": "neu"}')[0], 200)
+        self.assertSlices()
+
+
+if __name__ == '__main__':
+    unittest.main()